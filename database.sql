@@ -8,8 +8,31 @@ CREATE EXTENSION IF NOT EXISTS postgis;
 -- DANGER: Drop existing tables for clean rebuild
 DROP TABLE IF EXISTS swipes CASCADE;
 DROP TABLE IF EXISTS itinerary_items CASCADE;
+DROP TABLE IF EXISTS trip_participants CASCADE;
 DROP TABLE IF EXISTS trips CASCADE;
 DROP TABLE IF EXISTS places CASCADE;
+DROP TABLE IF EXISTS website_contents CASCADE;
+DROP TABLE IF EXISTS seed_jobs CASCADE;
+DROP TABLE IF EXISTS attractions CASCADE;
+
+-- ============================================================================
+-- WEBSITE CONTENTS TABLE - Scraped website content, deduplicated by hash
+-- ============================================================================
+CREATE TABLE website_contents (
+    -- blake2b digest of the content, shared by places with identical pages
+    hash TEXT PRIMARY KEY,
+
+    -- Scraped website content (max 2kb per site)
+    data JSONB NOT NULL,
+    -- Structure: {
+    --   "menu_keywords": ["ramen", "gyoza"],
+    --   "price_range": "$10-30",
+    --   "vibe_keywords": ["cozy", "traditional"],
+    --   "summary": "Scraped text..."
+    -- }
+
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
 
 -- ============================================================================
 -- PLACES TABLE - Core table for Google Places data
@@ -40,14 +63,11 @@ CREATE TABLE places (
     -- Website URL
     website_url TEXT,
 
-    -- Scraped website content (max 2kb per site)
-    website_content JSONB DEFAULT '{}'::jsonb,
-    -- Structure: {
-    --   "menu_keywords": ["ramen", "gyoza"],
-    --   "price_range": "$10-30",
-    --   "vibe_keywords": ["cozy", "traditional"],
-    --   "summary": "Scraped text..."
-    -- }
+    -- Scraped website content, NULL until a website has been scraped
+    website_content_hash TEXT REFERENCES website_contents(hash),
+
+    -- Set when details were fetched for the place; NULL until then
+    enriched_at TIMESTAMPTZ,
 
     -- Image URLs only - NO binary data (saves storage)
     image_urls TEXT[] DEFAULT ARRAY[]::TEXT[],
@@ -72,7 +92,21 @@ CREATE TABLE trips (
     end_date DATE,
     budget_limit DECIMAL(10, 2) DEFAULT 0.00,
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(user_id, name)
+);
+
+-- ============================================================================
+-- TRIP_PARTICIPANTS TABLE
+-- ============================================================================
+CREATE TABLE trip_participants (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    trip_id UUID REFERENCES trips(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    status TEXT DEFAULT 'invited',
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(trip_id, email)
 );
 
 -- ============================================================================
@@ -103,17 +137,58 @@ CREATE TABLE itinerary_items (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- ============================================================================
+-- ATTRACTIONS TABLE - Curated demo attractions loaded by seed_data.py
+-- ============================================================================
+CREATE TABLE attractions (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    name TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    category TEXT NOT NULL,
+    rating DECIMAL(2, 1),
+    review_count INTEGER DEFAULT 0,
+    price_point TEXT,
+    image_url TEXT,
+    description TEXT,
+    scout_tip TEXT,
+    is_local_favorite BOOLEAN DEFAULT FALSE,
+    lat DOUBLE PRECISION,
+    lng DOUBLE PRECISION,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(name, destination)
+);
+
+-- ============================================================================
+-- SEED_JOBS TABLE - Status of background city seeds, readable by every worker
+-- ============================================================================
+CREATE TABLE seed_jobs (
+    job_id UUID PRIMARY KEY,
+    city TEXT NOT NULL,
+    status TEXT NOT NULL, -- queued, running, done, failed
+    places_found INTEGER DEFAULT 0,
+    places_added INTEGER,
+    error TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- ============================================================================
 -- INDEXES for fast queries
 -- ============================================================================
-CREATE INDEX idx_places_city ON places(city);
+-- Composite indexes follow the API's WHERE + ORDER BY clauses:
+--   /api/places            city, category ORDER BY created_at, id
+--   ownership checks       trips WHERE user_id (index-only scan on id)
+--   liked places           swipes WHERE trip_id AND is_liked
+--   itinerary by trip      ORDER BY day_number, order_index
+-- Check plans with EXPLAIN ANALYZE after changing any of these queries.
+CREATE INDEX idx_places_city ON places(city, created_at, id);
 CREATE INDEX idx_places_category ON places(category);
-CREATE INDEX idx_places_city_category ON places(city, category);
+CREATE INDEX idx_places_city_category ON places(city, category, created_at, id);
 CREATE INDEX idx_places_google_id ON places(google_place_id);
-CREATE INDEX idx_trips_user ON trips(user_id);
+CREATE INDEX idx_trips_user ON trips(user_id) INCLUDE (id);
 CREATE INDEX idx_trips_city ON trips(city);
-CREATE INDEX idx_swipes_trip ON swipes(trip_id);
-CREATE INDEX idx_itinerary_trip ON itinerary_items(trip_id);
+CREATE INDEX idx_swipes_trip_liked ON swipes(trip_id, is_liked) INCLUDE (place_id);
+CREATE INDEX idx_itinerary_trip ON itinerary_items(trip_id, day_number, order_index);
 
 -- ============================================================================
 -- AUTO-UPDATE updated_at
@@ -131,3 +206,85 @@ CREATE TRIGGER places_updated_at
 
 CREATE TRIGGER trips_updated_at
     BEFORE UPDATE ON trips FOR EACH ROW EXECUTE FUNCTION update_updated_at();
+
+CREATE TRIGGER seed_jobs_updated_at
+    BEFORE UPDATE ON seed_jobs FOR EACH ROW EXECUTE FUNCTION update_updated_at();
+
+-- ============================================================================
+-- RPC: record a swipe only if the trip belongs to the user
+-- Returns the swipe row, or no rows when the trip is not owned by p_user_id
+-- ============================================================================
+CREATE OR REPLACE FUNCTION upsert_swipe_if_owner(
+    p_trip_id UUID,
+    p_place_id UUID,
+    p_user_id TEXT,
+    p_is_liked BOOLEAN
+)
+RETURNS SETOF swipes AS $$
+    INSERT INTO swipes (trip_id, place_id, user_id, is_liked)
+    SELECT p_trip_id, p_place_id, p_user_id, p_is_liked
+    WHERE EXISTS (
+        SELECT 1 FROM trips WHERE id = p_trip_id AND user_id = p_user_id
+    )
+    ON CONFLICT (trip_id, place_id, user_id)
+        DO UPDATE SET is_liked = EXCLUDED.is_liked
+    RETURNING *;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+-- ============================================================================
+-- RPC: liked places for a trip, joined in the database
+-- ============================================================================
+CREATE OR REPLACE FUNCTION get_liked_places(p_trip_id UUID)
+RETURNS SETOF jsonb AS $$
+    SELECT to_jsonb(p) || jsonb_build_object('website_content', wc.data)
+    FROM places p
+    JOIN swipes s ON s.place_id = p.id
+    LEFT JOIN website_contents wc ON wc.hash = p.website_content_hash
+    WHERE s.trip_id = p_trip_id AND s.is_liked = true;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- RPC: create the seed script's demo trip and its participants in one call
+-- Returns the trip id; re-running updates the trip and skips known participants
+-- ============================================================================
+CREATE OR REPLACE FUNCTION create_demo_trip(payload JSONB)
+RETURNS UUID AS $$
+DECLARE
+    v_trip_id UUID;
+BEGIN
+    INSERT INTO trips (name, city, start_date, end_date, budget_limit, user_id)
+    VALUES (
+        payload->>'name',
+        payload->>'city',
+        (payload->>'start_date')::DATE,
+        (payload->>'end_date')::DATE,
+        (payload->>'budget_limit')::DECIMAL,
+        payload->>'user_id'
+    )
+    ON CONFLICT (user_id, name) DO UPDATE
+        SET city = EXCLUDED.city,
+            start_date = EXCLUDED.start_date,
+            end_date = EXCLUDED.end_date,
+            budget_limit = EXCLUDED.budget_limit
+    RETURNING id INTO v_trip_id;
+
+    INSERT INTO trip_participants (trip_id, name, email, status)
+    SELECT v_trip_id, p.name, p.email, p.status
+    FROM jsonb_to_recordset(payload->'participants') AS p(name TEXT, email TEXT, status TEXT)
+    ON CONFLICT (trip_id, email) DO NOTHING;
+
+    RETURN v_trip_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- MIGRATION: JSON string scalars to native JSONB
+-- Places written before details/content were sent as objects hold JSON text
+-- as a string scalar. A no-op on a fresh rebuild; on an existing database run
+-- these statements on their own (without the DROPs above).
+-- ============================================================================
+UPDATE places SET details = (details #>> '{}')::jsonb
+WHERE jsonb_typeof(details) = 'string';
+
+UPDATE website_contents SET data = (data #>> '{}')::jsonb
+WHERE jsonb_typeof(data) = 'string';
@@ -5,20 +5,32 @@ With Google Places API parallel fetching and website scraping
 
 import os
 import asyncio
-import json
+import hashlib
+import heapq
 import re
-from datetime import date
-from typing import List, Optional, Dict, Any
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
+from functools import partial
+from html import unescape
+from datetime import date, datetime, timezone
+from urllib.parse import urlparse
+from typing import List, Optional, Dict, Any, Awaitable, Callable
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from cachetools import LRUCache, TTLCache
+from diskcache import Cache
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 import httpx
-import googlemaps
-import trafilatura
+import orjson
+import ahocorasick
 
 # Load environment variables
 load_dotenv()
@@ -27,10 +39,87 @@ load_dotenv()
 # CONFIGURATION
 # ============================================================================
 
+# API Keys
+GOOGLE_MAPS_KEY = os.getenv("GOOGLE_MAPS_KEY", "")
+SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
+REDIS_URL = os.getenv("REDIS_URL", "")
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "navi_cache"))
+
+# Every request acts as this user until real auth is added
+DEMO_USER_ID = "demo_user"
+
+# Initialize clients
+supabase: Optional[AsyncClient] = None
+redis_client: Optional[Redis] = None
+http_client: Optional[httpx.AsyncClient] = None
+
+if GOOGLE_MAPS_KEY:
+    print("✅ Google Maps configured")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared async clients on startup and close them on shutdown"""
+    global supabase, redis_client, http_client
+
+    # Shared by Google Places calls, website scraping and the image proxy
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000),
+        timeout=httpx.Timeout(10.0, connect=5.0)
+    )
+    if SUPABASE_URL and SUPABASE_KEY:
+        try:
+            # One keep-alive HTTP/2 pool reused by every PostgREST call
+            supabase_http = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+                timeout=30.0
+            )
+            supabase = await acreate_client(
+                SUPABASE_URL,
+                SUPABASE_KEY,
+                options=AsyncClientOptions(httpx_client=supabase_http)
+            )
+            print("✅ Supabase connected")
+        except Exception as e:
+            print(f"❌ Supabase connection failed: {e}")
+
+    if REDIS_URL:
+        try:
+            redis_client = Redis.from_url(REDIS_URL)
+            await redis_client.ping()
+            print("✅ Redis connected")
+        except Exception as e:
+            print(f"❌ Redis connection failed: {e}")
+            redis_client = None
+
+    yield
+
+    if supabase:
+        await supabase.postgrest.aclose()
+        supabase = None
+    if redis_client:
+        await redis_client.aclose()
+        redis_client = None
+    await http_client.aclose()
+    http_client = None
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson instead of the stdlib json module"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
 app = FastAPI(
     title="Navi Travel Planning API",
     description="Backend API with Google Places integration",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -41,28 +130,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# API Keys
-GOOGLE_MAPS_KEY = os.getenv("GOOGLE_MAPS_KEY", "")
-SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
+# On-disk cache for Google Places responses and scraped websites, shared by
+# all workers, so re-seeding a city skips the network
+disk_cache = Cache(CACHE_DIR)
+GOOGLE_CACHE_TTL = 24 * 60 * 60
+SCRAPE_CACHE_TTL = 7 * 24 * 60 * 60
 
-# Initialize clients
-supabase: Optional[Client] = None
-gmaps: Optional[googlemaps.Client] = None
+# Column sets for GET /api/places; the deck skips website data and timestamps
+PLACE_FIELDS = {
+    "deck": "id,name,category,details,image_urls,is_local_favorite",
+    "full": "*,...website_contents(website_content:data)",
+}
 
-if SUPABASE_URL and SUPABASE_KEY:
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        print("✅ Supabase connected")
-    except Exception as e:
-        print(f"❌ Supabase connection failed: {e}")
+# Google Places Web Service endpoints
+PLACES_TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+PLACES_DETAILS_FIELDS = "website,formatted_phone_number,opening_hours,editorial_summary,reviews,photos"
+# Photo URLs only differ by photo_reference, so the rest is built once
+PHOTO_URL_PREFIX = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&key={GOOGLE_MAPS_KEY}&photo_reference="
 
-if GOOGLE_MAPS_KEY:
-    try:
-        gmaps = googlemaps.Client(key=GOOGLE_MAPS_KEY)
-        print("✅ Google Maps connected")
-    except Exception as e:
-        print(f"❌ Google Maps connection failed: {e}")
+# Max websites fetched at once while seeding, overall and per host, so
+# places sharing a site (chains, tourism portals) don't hammer one origin
+_scrape_semaphore = asyncio.Semaphore(10)
+# Per-host semaphore and the number of scrapes holding or waiting on it;
+# entries are dropped once a host has no scrapes left
+_host_semaphores: Dict[str, list] = {}
+
+# Max rows per PostgREST upsert request when saving seeded places
+UPSERT_BATCH_SIZE = 500
 
 # Categories for parallel fetching
 CATEGORIES = {
@@ -73,6 +168,33 @@ CATEGORIES = {
     "Hidden Gems": ["park", "spa", "temple", "shrine", "viewpoint"]
 }
 
+# In-process cache for the read-mostly places endpoints, cleared after seeding
+PLACES_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+# In-flight place list queries, so identical concurrent requests share one
+_pending_places: Dict[tuple, asyncio.Task] = {}
+
+# Proxied photo bytes and content type by URL. Each uvicorn worker keeps its
+# own copy, so ~200MB in total is split across one worker per CPU
+IMAGE_CACHE_BYTES = 200 * 1024 * 1024 // (os.cpu_count() or 1)
+IMAGE_CACHE: LRUCache = LRUCache(maxsize=IMAGE_CACHE_BYTES, getsizeof=lambda v: len(v[0]))
+IMAGE_CACHE_HEADERS = {"Cache-Control": "public, max-age=86400"}
+
+# Only Places photo URLs are proxied, and only redirects to Google's photo CDN followed
+PHOTO_HOST = "maps.googleapis.com"
+PHOTO_PATH = "/maps/api/place/photo"
+PHOTO_CDN_SUFFIX = ".googleusercontent.com"
+
+# CDN URLs that Google photo URLs redirect to, so repeat requests skip Google
+PHOTO_REDIRECT_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+
+# Trip ids owned by each user (used when Redis is not configured)
+OWNED_TRIPS_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+# Background seed job status by job id; the seed_jobs table is the copy
+# every worker can read
+SEED_JOBS: TTLCache = TTLCache(maxsize=256, ttl=3600)
+
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -98,6 +220,8 @@ class SeedCityResponse(BaseModel):
     message: str
     places_added: int
     city: str
+    job_id: Optional[str] = None
+    places_found: int = 0
 
 class TripCreate(BaseModel):
     name: str
@@ -111,95 +235,321 @@ class SwipeCreate(BaseModel):
     place_id: str
     is_liked: bool = True
 
+# ============================================================================
+# SHARED CACHE (Redis, optional)
+# ============================================================================
+
+async def cached(key: str, ttl: int, fetcher: Callable[[], Awaitable[Any]]) -> Any:
+    """Read-through cache shared by all workers; calls fetcher directly without Redis"""
+    if redis_client:
+        try:
+            hit = await redis_client.get(key)
+            if hit is not None:
+                return orjson.loads(hit)
+        except RedisError as e:
+            print(f"Redis read error for {key}: {e}")
+
+    data = await fetcher()
+
+    if redis_client:
+        try:
+            await redis_client.setex(key, ttl, orjson.dumps(data))
+        except RedisError as e:
+            print(f"Redis write error for {key}: {e}")
+    return data
+
+
+async def invalidate(*keys: str) -> None:
+    """Drop keys from the shared cache"""
+    if not redis_client:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError as e:
+        print(f"Redis delete error for {keys}: {e}")
+
+
+async def invalidate_prefix(prefix: str) -> None:
+    """Drop every shared cache key starting with prefix"""
+    if not redis_client:
+        return
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await redis_client.delete(*keys)
+    except RedisError as e:
+        print(f"Redis delete error for {prefix}*: {e}")
+
+
+async def disk_cache_get(key: str) -> Any:
+    """Read from the on-disk cache in a thread, since diskcache does blocking SQLite I/O"""
+    return await asyncio.to_thread(disk_cache.get, key)
+
+
+async def disk_cache_set(key: str, value: Any, expire: int) -> None:
+    """Write to the on-disk cache in a thread"""
+    await asyncio.to_thread(disk_cache.set, key, value, expire=expire)
+
+
+async def remember_trip_owner(user_id: str, trip_id: str) -> None:
+    """Add a newly created trip to the user's cached set of owned trips"""
+    owned = OWNED_TRIPS_CACHE.get(user_id)
+    if owned is not None:
+        owned.add(trip_id)
+
+    if redis_client:
+        key = f"user_trips:{user_id}"
+        try:
+            if await redis_client.exists(key):
+                await redis_client.sadd(key, trip_id)
+        except RedisError as e:
+            print(f"Redis write error for {key}: {e}")
+
+
+async def user_owns_trip(user_id: str, trip_id: str) -> bool:
+    """
+    Check trip ownership against a cached set of the user's trip ids.
+    Only misses query the trips table, which also picks up trips created
+    by other workers.
+    """
+    key = f"user_trips:{user_id}"
+    if redis_client:
+        try:
+            if await redis_client.sismember(key, trip_id):
+                return True
+        except RedisError as e:
+            print(f"Redis read error for {key}: {e}")
+    else:
+        owned = OWNED_TRIPS_CACHE.get(user_id)
+        if owned is not None and trip_id in owned:
+            return True
+
+    response = await supabase.table("trips").select("id").eq("user_id", user_id).execute()
+    owned = {row["id"] for row in response.data}
+    OWNED_TRIPS_CACHE[user_id] = owned
+
+    if redis_client and owned:
+        try:
+            async with redis_client.pipeline() as pipe:
+                pipe.delete(key)
+                pipe.sadd(key, *owned)
+                pipe.expire(key, 300)
+                await pipe.execute()
+        except RedisError as e:
+            print(f"Redis write error for {key}: {e}")
+
+    return trip_id in owned
+
+
+async def save_seed_job(job_id: str, job: Dict) -> None:
+    """Record a seed job's status locally and in the seed_jobs table for other workers"""
+    SEED_JOBS[job_id] = dict(job)
+    try:
+        await supabase.table("seed_jobs").upsert(job, on_conflict="job_id").execute()
+    except Exception as e:
+        print(f"Error saving seed job {job_id}: {e}")
+
+
+async def load_seed_job(job_id: str) -> Optional[Dict]:
+    """Look up a seed job's status, falling back to the seed_jobs table"""
+    job = SEED_JOBS.get(job_id)
+    if job is not None:
+        return job
+    try:
+        uuid.UUID(job_id)
+    except ValueError:
+        return None
+    response = await supabase.table("seed_jobs").select(
+        "job_id,city,status,places_found,places_added,error"
+    ).eq("job_id", job_id).limit(1).execute()
+    if not response.data:
+        return None
+    return {key: value for key, value in response.data[0].items() if value is not None}
+
+
 # ============================================================================
 # GOOGLE PLACES API - PARALLEL FETCHING
 # ============================================================================
 
-async def fetch_places_by_category(city: str, category: str, place_types: List[str]) -> List[Dict]:
-    """Fetch places for a single category using Google Places API"""
-    if not gmaps:
+async def places_api_get(url: str, params: Dict[str, str]) -> Dict:
+    """Call a Google Places web service endpoint on the shared HTTP client"""
+    response = await http_client.get(url, params=params)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") not in ("OK", "ZERO_RESULTS"):
+        raise RuntimeError(f"{data.get('status')}: {data.get('error_message', '')}")
+    return data
+
+
+async def search_places(query: str, place_type: str) -> List[Dict]:
+    """Run a single Google Places Text Search request"""
+    key = f"textsearch:{query}:{place_type}"
+    results = await disk_cache_get(key)
+    if results is not None:
+        return results
+
+    data = await places_api_get(
+        PLACES_TEXT_SEARCH_URL,
+        {"query": query, "type": place_type, "key": GOOGLE_MAPS_KEY}
+    )
+    results = data.get("results", [])
+    await disk_cache_set(key, results, GOOGLE_CACHE_TTL)
+    return results
+
+
+async def fetch_places_by_type(city: str, category: str, place_type: str) -> List[Dict]:
+    """Fetch places for a single category/place type using Google Places API"""
+    if not GOOGLE_MAPS_KEY:
         return []
 
-    all_places = []
-    seen_ids = set()
+    results = await search_places(f"{place_type} in {city}", place_type)
 
-    for place_type in place_types:
-        try:
-            # Text search for this category in the city
-            query = f"{place_type} in {city}"
-            results = gmaps.places(query=query, type=place_type)
-
-            for place in results.get("results", [])[:10]:  # Max 10 per type
-                place_id = place.get("place_id")
-                if place_id and place_id not in seen_ids:
-                    seen_ids.add(place_id)
-
-                    # Get photo URLs (reference only, not binary)
-                    image_urls = []
-                    for photo in place.get("photos", [])[:3]:
-                        ref = photo.get("photo_reference")
-                        if ref:
-                            url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&photo_reference={ref}&key={GOOGLE_MAPS_KEY}"
-                            image_urls.append(url)
-
-                    all_places.append({
-                        "google_place_id": place_id,
-                        "name": place.get("name", ""),
-                        "city": city,
-                        "category": category,
-                        "location": place.get("geometry", {}).get("location"),
-                        "details": {
-                            "rating": place.get("rating"),
-                            "user_ratings_total": place.get("user_ratings_total", 0),
-                            "price_level": place.get("price_level"),
-                            "address": place.get("formatted_address", place.get("vicinity", "")),
-                            "types": place.get("types", []),
-                            "business_status": place.get("business_status"),
-                        },
-                        "image_urls": image_urls,
-                        "is_local_favorite": (
-                            place.get("rating", 0) >= 4.5 and
-                            place.get("user_ratings_total", 0) >= 500
-                        )
-                    })
-        except Exception as e:
-            print(f"Error fetching {place_type} in {city}: {e}")
+    places = []
+    for place in results[:10]:  # Max 10 per type
+        place_id = place.get("place_id")
+        if not place_id:
             continue
 
-    return all_places
+        # Get photo URLs (reference only, not binary)
+        image_urls = []
+        for photo in place.get("photos", [])[:3]:
+            ref = photo.get("photo_reference")
+            if ref:
+                url = PHOTO_URL_PREFIX + ref
+                image_urls.append(url)
+
+        places.append({
+            "google_place_id": place_id,
+            "name": place.get("name", ""),
+            "city": city,
+            "category": category,
+            "location": place.get("geometry", {}).get("location"),
+            "details": {
+                "rating": place.get("rating"),
+                "user_ratings_total": place.get("user_ratings_total", 0),
+                "price_level": place.get("price_level"),
+                "address": place.get("formatted_address", place.get("vicinity", "")),
+                "types": place.get("types", []),
+                "business_status": place.get("business_status"),
+            },
+            "image_urls": image_urls,
+            "is_local_favorite": (
+                place.get("rating", 0) >= 4.5 and
+                place.get("user_ratings_total", 0) >= 500
+            )
+        })
+
+    return places
 
 
 async def get_place_details(place_id: str) -> Dict:
     """Get detailed info for a place including website and photos"""
-    if not gmaps:
+    if not GOOGLE_MAPS_KEY:
         return {}
 
+    key = f"details:{place_id}"
+    result = await disk_cache_get(key)
+    if result is not None:
+        return result
+
     try:
-        details = gmaps.place(
-            place_id=place_id,
-            fields=["website", "formatted_phone_number", "opening_hours", "editorial_summary", "reviews", "photos"]
+        details = await places_api_get(
+            PLACES_DETAILS_URL,
+            {"place_id": place_id, "fields": PLACES_DETAILS_FIELDS, "key": GOOGLE_MAPS_KEY}
         )
-        return details.get("result", {})
+        result = details.get("result", {})
+        await disk_cache_set(key, result, GOOGLE_CACHE_TTL)
+        return result
     except Exception as e:
         print(f"Error getting details for {place_id}: {e}")
         return {}
 
 
+# Regexes for the fast, DOM-free text extractor, run on at most this much HTML
+MAX_SCRAPE_HTML = 256 * 1024
+_SCRIPT_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>|<!--.*?-->", re.S | re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+
+# Common food/menu and vibe keywords matched in scraped text
+FOOD_TERMS = ("ramen", "sushi", "pizza", "burger", "steak", "pasta", "coffee", "tea",
+              "beer", "wine", "cocktail", "dessert", "breakfast", "lunch", "dinner",
+              "noodle", "rice", "soup", "salad", "seafood", "vegetarian", "vegan")
+VIBE_TERMS = ("cozy", "romantic", "lively", "quiet", "traditional", "modern",
+              "family", "casual", "upscale", "trendy", "authentic", "hidden gem",
+              "local favorite", "busy", "peaceful", "scenic", "rooftop")
+
+# Price indicators and the price range each one implies
+PRICE_TERMS = {
+    "$$$": "$$$", "expensive": "$$$", "fine dining": "$$$",
+    "$$": "$$", "moderate": "$$",
+    "$": "$", "cheap": "$", "budget": "$",
+}
+
+# Built once at import; values are (kind, value) so one scan serves every check
+_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for _term in FOOD_TERMS + VIBE_TERMS:
+    _KEYWORD_AUTOMATON.add_word(_term, ("keyword", _term))
+for _term, _tier in PRICE_TERMS.items():
+    _KEYWORD_AUTOMATON.add_word(_term, ("price", _tier))
+_KEYWORD_AUTOMATON.make_automaton()
+
+
+def extract_text_fast(html: str) -> str:
+    """Strip scripts, styles and tags with regexes; good enough for keyword matching"""
+    text = _TAG_RE.sub(" ", _SCRIPT_RE.sub(" ", html))
+    return unescape(_WS_RE.sub(" ", text)).strip()
+
+
+@asynccontextmanager
+async def host_slot(host: str):
+    """Hold one of the host's scrape slots, forgetting the host when it goes idle"""
+    entry = _host_semaphores.get(host)
+    if entry is None:
+        entry = _host_semaphores[host] = [asyncio.Semaphore(2), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _host_semaphores[host]
+
+
 async def scrape_website(url: str) -> Dict[str, Any]:
-    """Scrape website content using trafilatura, limit to 2kb"""
+    """
+    Scrape website content, limit to 2kb.
+    Text is pulled from the first 256kb of HTML with regexes, off the event loop.
+    Successful scrapes are cached on disk for a week.
+    """
     if not url:
         return {}
 
+    key = f"scrape:{url}"
+    scraped = await disk_cache_get(key)
+    if scraped is None:
+        scraped = await fetch_website_content(url)
+        if scraped:
+            await disk_cache_set(key, scraped, SCRAPE_CACHE_TTL)
+    return scraped
+
+
+async def fetch_website_content(url: str) -> Dict[str, Any]:
+    """Fetch a website and extract its summary, keywords and price range"""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, follow_redirects=True)
+        # Take the per-host slot first so waiting on a busy host doesn't
+        # hold one of the global slots
+        async with host_slot(urlparse(url).netloc), _scrape_semaphore:
+            response = await http_client.get(url, follow_redirects=True)
             if response.status_code != 200:
                 return {}
 
-            html = response.text
+            html = response.text[:MAX_SCRAPE_HTML]
 
-        # Extract text using trafilatura
-        extracted = trafilatura.extract(html, include_comments=False, include_tables=False)
+        # Tag stripping is CPU-bound, so keep it off the event loop
+        extracted = await asyncio.to_thread(extract_text_fast, html)
 
         if not extracted:
             return {}
@@ -210,32 +560,19 @@ async def scrape_website(url: str) -> Dict[str, Any]:
         # Extract keywords for menu/price/vibe
         text_lower = text.lower()
 
-        # Common food/menu keywords
-        menu_keywords = []
-        food_terms = ["ramen", "sushi", "pizza", "burger", "steak", "pasta", "coffee", "tea",
-                     "beer", "wine", "cocktail", "dessert", "breakfast", "lunch", "dinner",
-                     "noodle", "rice", "soup", "salad", "seafood", "vegetarian", "vegan"]
-        for term in food_terms:
-            if term in text_lower:
-                menu_keywords.append(term)
-
-        # Price indicators
-        price_range = None
-        if "$$$" in text or "expensive" in text_lower or "fine dining" in text_lower:
-            price_range = "$$$"
-        elif "$$" in text or "moderate" in text_lower:
-            price_range = "$$"
-        elif "$" in text or "cheap" in text_lower or "budget" in text_lower:
-            price_range = "$"
-
-        # Vibe keywords
-        vibe_keywords = []
-        vibe_terms = ["cozy", "romantic", "lively", "quiet", "traditional", "modern",
-                     "family", "casual", "upscale", "trendy", "authentic", "hidden gem",
-                     "local favorite", "busy", "peaceful", "scenic", "rooftop"]
-        for term in vibe_terms:
-            if term in text_lower:
-                vibe_keywords.append(term)
+        # Keywords and price indicators, found in a single Aho-Corasick pass
+        found = set()
+        price_tiers = set()
+        for _, (kind, value) in _KEYWORD_AUTOMATON.iter(text_lower):
+            if kind == "price":
+                price_tiers.add(value)
+            else:
+                found.add(value)
+
+        menu_keywords = [term for term in FOOD_TERMS if term in found]
+        vibe_keywords = [term for term in VIBE_TERMS if term in found]
+        # The most expensive indicator wins
+        price_range = max(price_tiers, key=len, default=None)
 
         return {
             "summary": text[:500],  # Short summary
@@ -249,30 +586,102 @@ async def scrape_website(url: str) -> Dict[str, Any]:
         return {}
 
 
-async def seed_city(city: str) -> int:
+def apply_place_details(place: Dict, details: Dict) -> None:
+    """Merge a Place Details response into a place dict"""
+    place["website_url"] = details.get("website")
+    if "opening_hours" in details:
+        place["details"]["opening_hours"] = details["opening_hours"].get("weekday_text", [])
+    if "editorial_summary" in details:
+        place["details"]["editorial_summary"] = details["editorial_summary"].get("overview")
+    if "reviews" in details:
+        place["details"]["reviews"] = [
+            {"text": r.get("text", "")[:200], "rating": r.get("rating")}
+            for r in details["reviews"][:3]
+        ]
+    # Get more photos from place details (up to 10 total)
+    if "photos" in details:
+        existing_urls = set(place.get("image_urls", []))
+        for photo in details["photos"][:10]:
+            ref = photo.get("photo_reference")
+            if ref:
+                url = PHOTO_URL_PREFIX + ref
+                if url not in existing_urls:
+                    place["image_urls"].append(url)
+                    existing_urls.add(url)
+                    if len(place["image_urls"]) >= 10:
+                        break
+
+
+async def enrich_place(place: Dict, scrapes: Dict[str, asyncio.Task]) -> None:
     """
-    Main function to seed a city with places from Google Places API
-    Uses parallel fetching for speed
+    Fetch details for a place, then scrape its website.
+    scrapes maps URLs to scrape tasks shared across places, so a website
+    used by several places is fetched only once.
     """
-    if not gmaps or not supabase:
+    details = await get_place_details(place["google_place_id"])
+    if not details:
+        return
+    apply_place_details(place, details)
+    # Marked once details arrive, so places without a website or whose
+    # scrape fails are not enriched again on the next seed
+    place["enriched_at"] = datetime.now(timezone.utc).isoformat()
+
+    url = place.get("website_url")
+    if not url:
+        return
+    if url not in scrapes:
+        scrapes[url] = asyncio.ensure_future(scrape_website(url))
+    scraped = await scrapes[url]
+    if scraped:
+        place["website_content"] = scraped
+        place["website_content_hash"] = content_hash(scraped)
+
+
+def content_hash(content: Dict) -> str:
+    """Hash scraped website content so identical pages share one stored row"""
+    return hashlib.blake2b(orjson.dumps(content, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def place_row(place: Dict) -> Dict:
+    """Build the places table row for a fetched place"""
+    return {
+        "google_place_id": place["google_place_id"],
+        "name": place["name"],
+        "city": place["city"],
+        "category": place["category"],
+        "details": place.get("details", {}),
+        "website_url": place.get("website_url"),
+        "website_content_hash": place.get("website_content_hash"),
+        "enriched_at": place.get("enriched_at"),
+        "image_urls": place.get("image_urls", []),
+        "is_local_favorite": place.get("is_local_favorite", False),
+    }
+
+
+async def seed_city_fast(city: str) -> tuple:
+    """
+    Phase 1 of seeding: text search every category in parallel.
+    Returns all unique places and the top places picked for enrichment.
+    """
+    if not GOOGLE_MAPS_KEY or not supabase:
         raise HTTPException(status_code=500, detail="APIs not configured")
 
     print(f"🌍 Starting to seed {city}...")
 
-    # STEP 1: Parallel fetch all categories
-    tasks = []
-    for category, place_types in CATEGORIES.items():
-        tasks.append(fetch_places_by_category(city, category, place_types))
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # STEP 1: One text search per (category, place type), all in flight at once
+    searches = [(category, place_type) for category, place_types in CATEGORIES.items() for place_type in place_types]
+    results = await asyncio.gather(
+        *(fetch_places_by_type(city, category, place_type) for category, place_type in searches),
+        return_exceptions=True,
+    )
 
     # Flatten and deduplicate
     all_places = []
     seen_ids = set()
 
-    for result in results:
+    for (category, place_type), result in zip(searches, results):
         if isinstance(result, Exception):
-            print(f"Category fetch error: {result}")
+            print(f"Error fetching {place_type} ({category}) in {city}: {result}")
             continue
         for place in result:
             pid = place["google_place_id"]
@@ -282,140 +691,223 @@ async def seed_city(city: str) -> int:
 
     print(f"📍 Found {len(all_places)} unique places")
 
-    # STEP 2: Get detailed info for top 20 places (by rating)
-    top_places = sorted(
+    # STEP 2: Pick the top 20 places (by rating) for enrichment
+    top_places = heapq.nlargest(
+        20,
         all_places,
-        key=lambda x: (x["details"].get("rating") or 0) * (x["details"].get("user_ratings_total") or 0),
-        reverse=True
-    )[:20]
-
-    # Fetch details in parallel
-    detail_tasks = [get_place_details(p["google_place_id"]) for p in top_places]
-    details_results = await asyncio.gather(*detail_tasks, return_exceptions=True)
-
-    # Update places with details
-    for i, details in enumerate(details_results):
-        if isinstance(details, Exception) or not details:
-            continue
-        top_places[i]["website_url"] = details.get("website")
-        if "opening_hours" in details:
-            top_places[i]["details"]["opening_hours"] = details["opening_hours"].get("weekday_text", [])
-        if "editorial_summary" in details:
-            top_places[i]["details"]["editorial_summary"] = details["editorial_summary"].get("overview")
-        if "reviews" in details:
-            top_places[i]["details"]["reviews"] = [
-                {"text": r.get("text", "")[:200], "rating": r.get("rating")}
-                for r in details["reviews"][:3]
-            ]
-        # Get more photos from place details (up to 10 total)
-        if "photos" in details:
-            existing_urls = set(top_places[i].get("image_urls", []))
-            for photo in details["photos"][:10]:
-                ref = photo.get("photo_reference")
-                if ref:
-                    url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&photo_reference={ref}&key={GOOGLE_MAPS_KEY}"
-                    if url not in existing_urls:
-                        top_places[i]["image_urls"].append(url)
-                        existing_urls.add(url)
-                        if len(top_places[i]["image_urls"]) >= 10:
-                            break
-
-    # STEP 3: Scrape websites for top places (parallel)
-    print("🌐 Scraping websites for top places...")
-    websites = [p.get("website_url") for p in top_places]
-    scrape_tasks = [scrape_website(url) for url in websites]
-    scrape_results = await asyncio.gather(*scrape_tasks, return_exceptions=True)
-
-    for i, scraped in enumerate(scrape_results):
-        if isinstance(scraped, Exception) or not scraped:
-            continue
-        top_places[i]["website_content"] = scraped
+        key=lambda x: (x["details"].get("rating") or 0) * (x["details"].get("user_ratings_total") or 0)
+    )
+    return all_places, top_places
+
+
+async def seed_city_enrich(city: str, all_places: List[Dict], top_places: List[Dict]) -> int:
+    """Phases 2-4 of seeding: enrich the top places and save everything"""
+    # Places already enriched by an earlier seed keep their stored details and
+    # website content, so they skip enrichment and are only inserted if missing
+    existing = await supabase.table("places").select("google_place_id").eq(
+        "city", city
+    ).not_.is_("enriched_at", "null").execute()
+    enriched_ids = {row["google_place_id"] for row in existing.data}
+    to_enrich = [p for p in top_places if p["google_place_id"] not in enriched_ids]
+    if len(to_enrich) < len(top_places):
+        print(f"⏭️ Skipping {len(top_places) - len(to_enrich)} already enriched places")
+    top_places = to_enrich
+
+    # STEP 3: Fetch details and scrape websites for top places (parallel).
+    # Each place is scraped as soon as its own details arrive, so one slow
+    # details call no longer holds back every scrape.
+    print("🌐 Fetching details and scraping websites for top places...")
+    scrapes: Dict[str, asyncio.Task] = {}
+    enrich_tasks = [enrich_place(p, scrapes) for p in top_places]
+    enrich_results = await asyncio.gather(*enrich_tasks, return_exceptions=True)
+
+    for result in enrich_results:
+        if isinstance(result, Exception):
+            print(f"Enrichment error: {result}")
 
-    # Merge top_places back into all_places
     top_ids = {p["google_place_id"] for p in top_places}
     other_places = [p for p in all_places if p["google_place_id"] not in top_ids]
-    final_places = top_places + other_places
 
     # STEP 4: Batch insert into Supabase
-    print(f"💾 Saving {len(final_places)} places to database...")
-
-    # Prepare data for insertion
-    insert_data = []
-    for place in final_places:
-        loc = place.get("location")
-        insert_data.append({
-            "google_place_id": place["google_place_id"],
-            "name": place["name"],
-            "city": place["city"],
-            "category": place["category"],
-            "details": json.dumps(place.get("details", {})),
-            "website_url": place.get("website_url"),
-            "website_content": json.dumps(place.get("website_content", {})),
-            "image_urls": place.get("image_urls", []),
-            "is_local_favorite": place.get("is_local_favorite", False),
-        })
+    print(f"💾 Saving {len(all_places)} places to database...")
 
-    # Batch insert (upsert to handle duplicates)
+    # Enriched top places overwrite stored rows. The rest are only inserted
+    # when new (ON CONFLICT DO NOTHING), so unchanged rows cost no writes.
+    top_rows = [place_row(p) for p in top_places]
+    other_rows = [place_row(p) for p in other_places]
     try:
-        response = supabase.table("places").upsert(
-            insert_data,
-            on_conflict="google_place_id"
-        ).execute()
-        print(f"✅ Successfully saved {len(response.data)} places")
-        return len(response.data)
+        # Scraped content is stored once per distinct page; places reference
+        # it by hash, so it has to exist before the place rows are written
+        contents = {p["website_content_hash"]: p["website_content"] for p in top_places if p.get("website_content_hash")}
+        if contents:
+            await supabase.table("website_contents").upsert(
+                [{"hash": h, "data": data} for h, data in contents.items()],
+                on_conflict="hash",
+                ignore_duplicates=True
+            ).execute()
+
+        writes = [
+            supabase.table("places").upsert(
+                rows[i:i + UPSERT_BATCH_SIZE],
+                on_conflict="google_place_id",
+                ignore_duplicates=ignore_duplicates
+            ).execute()
+            for rows, ignore_duplicates in ((top_rows, False), (other_rows, True))
+            for i in range(0, len(rows), UPSERT_BATCH_SIZE)
+        ]
+        responses = await asyncio.gather(*writes)
+        saved = sum(len(response.data) for response in responses)
+        print(f"✅ Successfully saved {saved} places")
+        PLACES_CACHE.clear()
+        await invalidate_prefix("places:")
+        return saved
     except Exception as e:
         print(f"❌ Database error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def run_seed_job(job_id: str, city: str, all_places: List[Dict], top_places: List[Dict]) -> None:
+    """Run the enrichment phases as a background task, recording job status"""
+    job = {"job_id": job_id, "city": city, "status": "running", "places_found": len(all_places)}
+    await save_seed_job(job_id, job)
+    try:
+        job["places_added"] = await seed_city_enrich(city, all_places, top_places)
+        job["status"] = "done"
+    except HTTPException as e:
+        print(f"❌ Seeding {city} failed: {e.detail}")
+        job["status"], job["error"] = "failed", e.detail
+    except Exception as e:
+        print(f"❌ Seeding {city} failed: {e}")
+        job["status"], job["error"] = "failed", str(e)
+    await save_seed_job(job_id, job)
+
+
+# ============================================================================
+# PLACE LIST QUERIES
+# ============================================================================
+
+async def fetch_place_pages(
+    city: Optional[str], category: Optional[str], limit: int, offset: int, fields: str
+) -> List[Dict]:
+    """Fetch a page of places together with the page after it in one query"""
+    query = supabase.table("places").select(PLACE_FIELDS[fields])
+
+    if city:
+        query = query.eq("city", city)
+    if category:
+        query = query.eq("category", category)
+
+    response = await query.order("created_at").order("id").range(offset, offset + 2 * limit - 1).execute()
+    return response.data
+
+
+async def load_place_page(
+    city: Optional[str], category: Optional[str], limit: int, offset: int, fields: str
+) -> List[Dict]:
+    """Load a page of places through the caches, caching the following page as well"""
+    pages = await cached(
+        f"places:{city}:{category}:{limit}:{offset}:{fields}",
+        120,
+        partial(fetch_place_pages, city, category, limit, offset, fields)
+    )
+    PLACES_CACHE[("list", city, category, limit, offset, fields)] = pages[:limit]
+    PLACES_CACHE[("list", city, category, limit, offset + limit, fields)] = pages[limit:]
+    return pages[:limit]
+
+
+def place_page_task(
+    city: Optional[str], category: Optional[str], limit: int, offset: int, fields: str
+) -> asyncio.Task:
+    """Return the in-flight load for a page, so identical requests share one query"""
+    key = ("list", city, category, limit, offset, fields)
+    task = _pending_places.get(key)
+    if task is None:
+        task = asyncio.ensure_future(load_place_page(city, category, limit, offset, fields))
+        _pending_places[key] = task
+        task.add_done_callback(lambda _: _pending_places.pop(key, None))
+    return task
+
+
+def log_prefetch_error(task: asyncio.Task) -> None:
+    """Report failures of background prefetches, which nobody awaits"""
+    if not task.cancelled() and task.exception():
+        print(f"Prefetch error: {task.exception()}")
+
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
 
-@app.post("/api/seed-city", response_model=SeedCityResponse)
+@app.post("/api/seed-city", response_model=SeedCityResponse, status_code=202)
 async def api_seed_city(request: SeedCityRequest, background_tasks: BackgroundTasks):
     """
     Seed a city with places from Google Places API.
-    Fetches ~100 places across 5 categories in parallel.
+    Fetches ~100 places across 5 categories in parallel, then enriches and
+    saves them in the background. Poll /api/seed-city/{job_id} for progress.
     """
+    if not GOOGLE_MAPS_KEY or not supabase:
+        raise HTTPException(status_code=500, detail="APIs not configured")
+
     city = request.city
-    places_added = await seed_city(city)
+    all_places, top_places = await seed_city_fast(city)
+
+    job_id = str(uuid.uuid4())
+    await save_seed_job(job_id, {
+        "job_id": job_id, "city": city, "status": "queued", "places_found": len(all_places)
+    })
+    background_tasks.add_task(run_seed_job, job_id, city, all_places, top_places)
 
     return SeedCityResponse(
         success=True,
-        message=f"Successfully seeded {city} with {places_added} places",
-        places_added=places_added,
-        city=city
+        message=f"Seeding {city} has been queued",
+        places_added=0,
+        city=city,
+        job_id=job_id,
+        places_found=len(all_places)
     )
 
 
+@app.get("/api/seed-city/{job_id}")
+async def get_seed_job(job_id: str):
+    """Get the status of a background seed job"""
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Supabase not configured")
+
+    job = await load_seed_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Seed job not found")
+    return job
+
+
 @app.get("/api/places")
 async def get_places(
     city: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: str = Query("deck", pattern="^(deck|full)$")
 ):
-    """Get places from database, optionally filtered by city and category"""
+    """
+    Get places from database, optionally filtered by city and category.
+    fields=deck returns only the columns the swipe deck renders.
+    """
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
 
-    query = supabase.table("places").select("*")
+    # Rows come straight from Postgres, so they are returned as an
+    # ORJSONResponse to skip FastAPI's jsonable_encoder pass over every row
+    page = PLACES_CACHE.get(("list", city, category, limit, offset, fields))
+    if page is None:
+        # The shield keeps a shared query alive for other waiting requests
+        # if this client disconnects
+        page = await asyncio.shield(place_page_task(city, category, limit, offset, fields))
 
-    if city:
-        query = query.eq("city", city)
-    if category:
-        query = query.eq("category", category)
-
-    response = query.limit(limit).execute()
-
-    # Parse JSONB fields
-    places = []
-    for row in response.data:
-        row["details"] = json.loads(row["details"]) if isinstance(row["details"], str) else row["details"]
-        row["website_content"] = json.loads(row["website_content"]) if isinstance(row["website_content"], str) else row["website_content"]
-        places.append(row)
+    # Keep the next page warm so a deck paging forward is served from memory
+    next_offset = offset + limit
+    if len(page) == limit and ("list", city, category, limit, next_offset, fields) not in PLACES_CACHE:
+        place_page_task(city, category, limit, next_offset, fields).add_done_callback(log_prefetch_error)
 
-    return places
+    return ORJSONResponse(page)
 
 
 @app.get("/api/places/{place_id}")
@@ -424,15 +916,26 @@ async def get_place(place_id: str):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
 
-    response = supabase.table("places").select("*").eq("id", place_id).single().execute()
+    key = ("place", place_id)
+    hit = PLACES_CACHE.get(key)
+    if hit is not None:
+        return ORJSONResponse(hit)
+
+    response = await supabase.table("places").select(PLACE_FIELDS["full"]).eq("id", place_id).single().execute()
     if not response.data:
         raise HTTPException(status_code=404, detail="Place not found")
 
     place = response.data
-    place["details"] = json.loads(place["details"]) if isinstance(place["details"], str) else place["details"]
-    place["website_content"] = json.loads(place["website_content"]) if isinstance(place["website_content"], str) else place["website_content"]
+    PLACES_CACHE[key] = place
+    return ORJSONResponse(place)
 
-    return place
+
+@app.post("/api/admin/cache/flush")
+async def flush_cache():
+    """Invalidate cached place lookups, e.g. after seeding a city by hand"""
+    PLACES_CACHE.clear()
+    await invalidate_prefix("places:")
+    return {"success": True}
 
 
 @app.post("/api/trips")
@@ -447,10 +950,11 @@ async def create_trip(trip: TripCreate):
         "start_date": trip.start_date,
         "end_date": trip.end_date,
         "budget_limit": trip.budget_limit or 0,
-        "user_id": "demo_user"
+        "user_id": DEMO_USER_ID
     }
 
-    response = supabase.table("trips").insert(trip_data).execute()
+    response = await supabase.table("trips").insert(trip_data).execute()
+    await remember_trip_owner(DEMO_USER_ID, response.data[0]["id"])
     return response.data[0]
 
 
@@ -460,10 +964,13 @@ async def get_trip(trip_id: str):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
 
-    response = supabase.table("trips").select("*").eq("id", trip_id).single().execute()
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Trip not found")
-    return response.data
+    async def fetch_trip() -> Dict:
+        response = await supabase.table("trips").select("*").eq("id", trip_id).single().execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Trip not found")
+        return response.data
+
+    return await cached(f"trip:{trip_id}", 30, fetch_trip)
 
 
 @app.post("/api/swipes")
@@ -472,18 +979,18 @@ async def create_swipe(swipe: SwipeCreate):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
 
-    swipe_data = {
-        "trip_id": swipe.trip_id,
-        "place_id": swipe.place_id,
-        "is_liked": swipe.is_liked,
-        "user_id": "demo_user"
-    }
-
-    response = supabase.table("swipes").upsert(
-        swipe_data,
-        on_conflict="trip_id,place_id,user_id"
-    ).execute()
+    # Ownership is checked inside the same statement as the upsert, so a
+    # swipe on someone else's trip costs no extra round-trip
+    response = await supabase.rpc("upsert_swipe_if_owner", {
+        "p_trip_id": swipe.trip_id,
+        "p_place_id": swipe.place_id,
+        "p_user_id": DEMO_USER_ID,
+        "p_is_liked": swipe.is_liked,
+    }).execute()
+    if not response.data:
+        raise HTTPException(status_code=404, detail="Trip not found")
 
+    await invalidate(f"liked:{swipe.trip_id}")
     return response.data[0]
 
 
@@ -493,16 +1000,15 @@ async def get_liked_places(trip_id: str):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
 
-    # Get liked swipes
-    swipes = supabase.table("swipes").select("place_id").eq("trip_id", trip_id).eq("is_liked", True).execute()
-    place_ids = [s["place_id"] for s in swipes.data]
+    if not await user_owns_trip(DEMO_USER_ID, trip_id):
+        raise HTTPException(status_code=404, detail="Trip not found")
 
-    if not place_ids:
-        return []
+    async def fetch_liked_places() -> List[Dict]:
+        # Swipes joined to places inside Postgres, returned as plain place rows
+        response = await supabase.rpc("get_liked_places", {"p_trip_id": trip_id}).execute()
+        return response.data
 
-    # Get place details
-    places = supabase.table("places").select("*").in_("id", place_ids).execute()
-    return places.data
+    return ORJSONResponse(await cached(f"liked:{trip_id}", 30, fetch_liked_places))
 
 
 # ============================================================================
@@ -512,15 +1018,61 @@ async def get_liked_places(trip_id: str):
 @app.get("/api/image-proxy")
 async def image_proxy(url: str = Query(...)):
     """Proxy Google Places photos to avoid CORS issues"""
-    if not url.startswith("https://maps.googleapis.com"):
+    parsed = urlparse(url)
+    if parsed.scheme != "https" or parsed.hostname != PHOTO_HOST or parsed.path != PHOTO_PATH:
         raise HTTPException(status_code=400, detail="Invalid URL")
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, follow_redirects=True)
-        return Response(
-            content=response.content,
-            media_type=response.headers.get("content-type", "image/jpeg")
-        )
+    location = PHOTO_REDIRECT_CACHE.get(url)
+    if location is not None:
+        return RedirectResponse(location, status_code=302, headers=IMAGE_CACHE_HEADERS)
+
+    hit = IMAGE_CACHE.get(url)
+    if hit is not None:
+        content, media_type = hit
+        return Response(content=content, media_type=media_type, headers=IMAGE_CACHE_HEADERS)
+
+    request = http_client.build_request("GET", url)
+    upstream = await http_client.send(request, stream=True)
+
+    # Google answers with a redirect to its CDN; send the browser there
+    # directly instead of downloading the image through the proxy
+    if upstream.is_redirect and "location" in upstream.headers:
+        await upstream.aclose()
+        location = upstream.headers["location"]
+        target = urlparse(location)
+        if target.scheme != "https" or not (target.hostname or "").endswith(PHOTO_CDN_SUFFIX):
+            raise HTTPException(status_code=502, detail="Unexpected image redirect")
+        PHOTO_REDIRECT_CACHE[url] = location
+        return RedirectResponse(location, status_code=302, headers=IMAGE_CACHE_HEADERS)
+
+    media_type = upstream.headers.get("content-type", "image/jpeg")
+    if upstream.status_code != 200 or not media_type.startswith("image/"):
+        await upstream.aclose()
+        raise HTTPException(status_code=502, detail="Failed to fetch image")
+
+    # Stream the image through instead of buffering it; the upstream
+    # response is closed once the body has been sent
+    async def stream_and_cache():
+        chunks = []
+        size = 0
+        async for chunk in upstream.aiter_bytes():
+            # Stop buffering once the image can no longer fit in the cache
+            if chunks is not None:
+                size += len(chunk)
+                if size <= IMAGE_CACHE.maxsize:
+                    chunks.append(chunk)
+                else:
+                    chunks = None
+            yield chunk
+        if chunks is not None:
+            IMAGE_CACHE[url] = (b"".join(chunks), media_type)
+
+    return StreamingResponse(
+        stream_and_cache(),
+        media_type=media_type,
+        headers=IMAGE_CACHE_HEADERS,
+        background=BackgroundTask(upstream.aclose)
+    )
 
 
 # ============================================================================
@@ -533,7 +1085,8 @@ async def health():
     return {
         "status": "healthy",
         "google_maps": bool(GOOGLE_MAPS_KEY),
-        "supabase": bool(supabase)
+        "supabase": bool(supabase),
+        "redis": bool(redis_client)
     }
 
 
@@ -557,4 +1110,14 @@ async def read_index():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools ship with uvicorn[standard]; each worker runs its own
+    # lifespan, so every process gets its own Supabase/Redis/HTTP clients
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+        log_level="warning"
+    )